@@ -4,6 +4,8 @@
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Tuple
 
@@ -19,6 +21,9 @@ from slugify import slugify
 
 logger = logging.getLogger(__name__)
 
+_PAGE_SIZE = 1000
+_MAX_WORKERS = 8
+
 
 class Pipeline:
     def __init__(self, configuration: Configuration, retriever: Retrieve, tempdir: str):
@@ -26,46 +31,115 @@ class Pipeline:
         self._retriever = retriever
         self._tempdir = tempdir
 
-    def get_ports(self) -> Tuple:
-        base_url = f"{self._configuration['base_url']}/PortWatch_ports_database/FeatureServer/0/query"
-        ports_rows = []
-        geojson_features = []
-        offset = 0
-        limit = 1000
+    def _download_json(
+        self, retriever: Retrieve, url: str, parameters: Dict, filename: str
+    ) -> Dict:
+        try:
+            return retriever.download_json(
+                url, parameters=parameters, filename=filename
+            )
+        except RequestsJSONDecodeError as exc:
+            # Extra debug logging for Jenkins so we can see what ArcGIS is returning
+            logger.error(
+                "JSONDecodeError when calling %s for %s",
+                url,
+                filename,
+            )
+            with Download(user_agent="portwatch-debug") as d:
+                d.download(url, parameters=parameters)
+                resp = d.response
+                logger.error("DEBUG %s status_code: %s", filename, resp.status_code)
+                logger.error(
+                    "DEBUG %s content-type: %s",
+                    filename,
+                    resp.headers.get("content-type"),
+                )
+                body_preview = resp.text[:1000]  # avoid flooding Jenkins logs
+                logger.error(
+                    "DEBUG %s body (first 1000 chars): %r",
+                    filename,
+                    body_preview,
+                )
+
+                # Second attempt: try to parse the debug response as JSON
+                try:
+                    return resp.json()
+                except Exception as exc2:
+                    logger.error(
+                        "Second JSON parse attempt also failed for %s; giving up.",
+                        filename,
+                    )
+                    # Re-raise the original error so the scraper clearly fails
+                    raise exc from exc2
+
+    def _fetch_pages(self, base_url: str, base_params: Dict, filename: str) -> List:
+        # Get the total count first so that the pages can be requested concurrently
+        count_params = {
+            "where": base_params["where"],
+            "returnCountOnly": "true",
+            "f": "json",
+        }
+        data = self._download_json(
+            self._retriever, base_url, count_params, f"{filename}_count.json"
+        )
+        offsets = range(0, data.get("count", 0), _PAGE_SIZE)
+
+        # Download keeps the last response on the instance, so each worker
+        # thread gets its own downloader
+        downloaders = []
+        local = threading.local()
 
-        while True:
+        def fetch_page(offset: int) -> List:
+            if len(offsets) == 1:
+                retriever = self._retriever
+            else:
+                retriever = getattr(local, "retriever", None)
+                if retriever is None:
+                    downloader = Download()
+                    downloaders.append(downloader)
+                    retriever = self._retriever.clone(downloader)
+                    local.retriever = retriever
             params = {
-                "where": "1=1",
-                "outFields": "*",
-                "outSR": 4326,
-                "f": "geojson",
-                "orderByFields": "OBJECTID",
+                **base_params,
                 "resultOffset": offset,
-                "resultRecordCount": limit,
+                "resultRecordCount": _PAGE_SIZE,
             }
-            data = self._retriever.download_json(
-                base_url, parameters=params, filename="ports.json"
+            data = self._download_json(
+                retriever, base_url, params, f"{filename}_{offset}.json"
             )
+            return data.get("features", [])
 
-            features = data.get("features", [])
-            if not features:
-                break
+        try:
+            with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+                pages = list(executor.map(fetch_page, offsets))
+        finally:
+            for downloader in downloaders:
+                downloader.close()
 
-            for feature in features:
-                props = feature.get("properties", {}) or {}
-                props.pop("ObjectId", None)
+        return [feature for page in pages for feature in page]
 
-                # Create features for geojson
-                feature["properties"] = props
-                geojson_features.append(feature)
+    def get_ports(self) -> Tuple:
+        base_url = f"{self._configuration['base_url']}/PortWatch_ports_database/FeatureServer/0/query"
+        params = {
+            "where": "1=1",
+            "outFields": "*",
+            "outSR": 4326,
+            "f": "geojson",
+            "orderByFields": "OBJECTID",
+        }
+        ports_rows = []
+        geojson_features = []
 
-                # Create rows for csv
-                ports_rows.append(props)
+        for feature in self._fetch_pages(base_url, params, "ports"):
+            props = feature.get("properties", {}) or {}
+            props.pop("ObjectId", None)
 
-            if len(features) < limit:
-                break
+            # Create features for geojson
+            feature["properties"] = props
+            geojson_features.append(feature)
 
-            offset += limit
+            # Create rows for csv
+            ports_rows.append(props)
 
         ports_geojson = {
             "type": "FeatureCollection",
@@ -156,44 +230,26 @@ class Pipeline:
 
     def get_chokepoints(self) -> Tuple:
         base_url = f"{self._configuration['base_url']}/PortWatch_chokepoints_database/FeatureServer/0/query"
+        params = {
+            "where": "1=1",
+            "outFields": "*",
+            "outSR": 4326,
+            "f": "geojson",
+            "orderByFields": "OBJECTID",
+        }
         chokepoints_rows = []
         geojson_features = []
-        offset = 0
-        limit = 1000
 
-        while True:
-            params = {
-                "where": "1=1",
-                "outFields": "*",
-                "outSR": 4326,
-                "f": "geojson",
-                "orderByFields": "OBJECTID",
-                "resultOffset": offset,
-                "resultRecordCount": limit,
-            }
-            data = self._retriever.download_json(
-                base_url, parameters=params, filename="chokepoints.json"
-            )
-
-            features = data.get("features", [])
-            if not features:
-                break
+        for feature in self._fetch_pages(base_url, params, "chokepoints"):
+            props = feature.get("properties", {}) or {}
+            props.pop("ObjectId", None)
 
-            for feature in features:
-                props = feature.get("properties", {}) or {}
-                props.pop("ObjectId", None)
+            # Create features for geojson
+            feature["properties"] = props
+            geojson_features.append(feature)
 
-                # Create features for geojson
-                feature["properties"] = props
-                geojson_features.append(feature)
-
-                # Create rows for csv
-                chokepoints_rows.append(props)
-
-            if len(features) < limit:
-                break
-
-            offset += limit
+            # Create rows for csv
+            chokepoints_rows.append(props)
 
         chokepoints_geojson = {
             "type": "FeatureCollection",
@@ -273,36 +329,17 @@ class Pipeline:
 
     def get_daily_chokepoints(self) -> List:
         base_url = f"{self._configuration['base_url']}/Daily_Chokepoints_Data/FeatureServer/0/query"
-        all_data = []
-        offset = 0
-        limit = 1000
-
-        while True:
-            params = {
-                "where": "1=1",
-                "outFields": "*",
-                "outSR": 4326,
-                "f": "json",
-                "orderByFields": "OBJECTID",
-                "resultOffset": offset,
-                "resultRecordCount": limit,
-            }
-            data = self._retriever.download_json(
-                base_url, parameters=params, filename="daily_chokepoints.json"
-            )
-
-            features = data.get("features", [])
-            if not features:
-                break
-
-            for feature in features:
-                attrs = feature.get("attributes", {})
-                all_data.append(attrs)
-
-            if len(features) < limit:
-                break
-
-            offset += limit
+        params = {
+            "where": "1=1",
+            "outFields": "*",
+            "outSR": 4326,
+            "f": "json",
+            "orderByFields": "OBJECTID",
+        }
+        all_data = [
+            feature.get("attributes", {})
+            for feature in self._fetch_pages(base_url, params, "daily_chokepoints")
+        ]
 
         for row in all_data:
             row["date"] = datetime.fromtimestamp(row["date"] / 1000, tz=timezone.utc)
@@ -363,79 +400,17 @@ class Pipeline:
         base_url = (
             f"{self._configuration['base_url']}/Daily_Trade_Data/FeatureServer/0/query"
         )
-        all_data = []
-        offset = 0
-        limit = 1000
-
-        while True:
-            params = {
-                "where": f"ISO3='{iso3}'",
-                "outFields": "*",
-                "outSR": 4326,
-                "f": "json",
-                "orderByFields": "OBJECTID",
-                "resultOffset": offset,
-                "resultRecordCount": limit,
-            }
-            # data = self._retriever.download_json(
-            #     base_url, parameters=params, filename="daily_ports.json"
-            # )
-
-            try:
-                data = self._retriever.download_json(
-                    base_url, parameters=params, filename="daily_ports.json"
-                )
-            except RequestsJSONDecodeError as exc:
-                # Extra debug logging for Jenkins so we can see what ArcGIS is returning
-                logger.error(
-                    "JSONDecodeError when calling Daily_Trade_Data endpoint "
-                    "for iso3=%s, offset=%s, limit=%s",
-                    iso3,
-                    offset,
-                    limit,
-                )
-                with Download(user_agent="portwatch-debug") as d:
-                    d.download(base_url, parameters=params)
-                    resp = d.response
-                    logger.error(
-                        "DEBUG Daily_Trade_Data status_code: %s", resp.status_code
-                    )
-                    logger.error(
-                        "DEBUG Daily_Trade_Data content-type: %s",
-                        resp.headers.get("content-type"),
-                    )
-                    body_preview = resp.text[:1000]  # avoid flooding Jenkins logs
-                    logger.error(
-                        "DEBUG Daily_Trade_Data body (first 1000 chars): %r",
-                        body_preview,
-                    )
-
-                    # Second attempt: try to parse the debug response as JSON
-                    try:
-                        data = resp.json()
-                    except Exception as exc2:
-                        logger.error(
-                            "Second JSON parse attempt also failed for iso3=%s, "
-                            "offset=%s, limit=%s; giving up.",
-                            iso3,
-                            offset,
-                            limit,
-                        )
-                        # Re-raise the original error so the scraper clearly fails
-                        raise exc from exc2
-
-            features = data.get("features", [])
-            if not features:
-                break
-
-            for feature in features:
-                attrs = feature.get("attributes", {})
-                all_data.append(attrs)
-
-            if len(features) < limit:
-                break
-
-            offset += limit
+        params = {
+            "where": f"ISO3='{iso3}'",
+            "outFields": "*",
+            "outSR": 4326,
+            "f": "json",
+            "orderByFields": "OBJECTID",
+        }
+        all_data = [
+            feature.get("attributes", {})
+            for feature in self._fetch_pages(base_url, params, "daily_ports")
+        ]
 
         for row in all_data:
             row["date"] = datetime.fromtimestamp(row["date"] / 1000, tz=timezone.utc)
@@ -506,43 +481,25 @@ class Pipeline:
 
     def get_disruptions(self) -> Tuple:
         base_url = f"{self._configuration['base_url']}/portwatch_disruptions_database/FeatureServer/0/query"
+        params = {
+            "where": "1=1",
+            "outFields": "*",
+            "outSR": 4326,
+            "f": "geojson",
+            "orderByFields": "OBJECTID",
+        }
         disruptions_rows = []
         geojson_features = []
-        offset = 0
-        limit = 1000
-
-        while True:
-            params = {
-                "where": "1=1",
-                "outFields": "*",
-                "outSR": 4326,
-                "f": "geojson",
-                "orderByFields": "OBJECTID",
-                "resultOffset": offset,
-                "resultRecordCount": limit,
-            }
-            data = self._retriever.download_json(
-                base_url, parameters=params, filename="disruptions.json"
-            )
-
-            features = data.get("features", [])
-            if not features:
-                break
-
-            for feature in features:
-                props = feature.get("properties", {}) or {}
-
-                # Create features for geojson
-                feature["properties"] = props
-                geojson_features.append(feature)
 
-                # Create rows for csv
-                disruptions_rows.append(props)
+        for feature in self._fetch_pages(base_url, params, "disruptions"):
+            props = feature.get("properties", {}) or {}
 
-            if len(features) < limit:
-                break
+            # Create features for geojson
+            feature["properties"] = props
+            geojson_features.append(feature)
 
-            offset += limit
+            # Create rows for csv
+            disruptions_rows.append(props)
 
         disruptions_geojson = {
             "type": "FeatureCollection",